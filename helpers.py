@@ -1,62 +1,139 @@
 # helpers.py  (or paste below existing code in main.py)
 
-import httpx, re, json, time, urllib.parse
+import asyncio, httpx, re, json, sys, time, urllib.parse
+from cachetools import TTLCache
 from fastapi import HTTPException
 
-def fetch_robots_txt(domain: str) -> str:
+# Successful robots.txt / PSI lookups are reused for 10 minutes; failures are not cached.
+ROBOTS_CACHE = TTLCache(maxsize=10_000, ttl=600)
+PSI_CACHE = TTLCache(maxsize=10_000, ttl=600)
+
+# Fetched pages (bounded by their in-memory size, 64 MB in total), shared for two
+# minutes so an audit sequence on one URL downloads it only once.
+PAGE_CACHE = TTLCache(maxsize=64_000_000, ttl=120, getsizeof=sys.getsizeof)
+
+def make_client() -> httpx.AsyncClient:
+    """
+    One pooled client for every outbound call, so repeat hosts reuse TCP/TLS.
+    Opened on app startup and closed on shutdown (see main.py).
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        headers={"User-Agent": "Mozilla/5.0 (SEO-Auditor)"},
+    )
+
+MAX_BYTES = 2_000_000
+
+async def fetch_html(client: httpx.AsyncClient, url: str) -> str:
+    """Stream the page body, giving up once it grows past MAX_BYTES."""
+    try:
+        async with client.stream("GET", url) as r:
+            r.raise_for_status()
+            body = bytearray()
+            async for chunk in r.aiter_bytes():
+                body += chunk
+                if len(body) > MAX_BYTES:
+                    raise ValueError(f"page is larger than {MAX_BYTES} bytes")
+            return body.decode(r.encoding or "utf-8", errors="replace")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"page fetch failed: {e}")
+
+async def get_page(client: httpx.AsyncClient, url: str) -> str:
+    html = PAGE_CACHE.get(url)
+    if html is None:
+        html = await fetch_html(client, url)
+        PAGE_CACHE[url] = html
+    return html
+
+class RobotsTxtNotFound(HTTPException):
+    """robots.txt answered 404; still a 400 for /robots-check, but callers can tell it apart."""
+
+async def fetch_robots_txt(client: httpx.AsyncClient, domain: str) -> str:
+    cached = ROBOTS_CACHE.get(domain)
+    if cached is not None:
+        return cached
     url = urllib.parse.urljoin(domain, "/robots.txt")
     try:
-        r = httpx.get(url, timeout=10)
+        r = await client.get(url)
         r.raise_for_status()
-        return r.text
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"robots.txt fetch failed: {e}")
+        missing = isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404
+        error_cls = RobotsTxtNotFound if missing else HTTPException
+        raise error_cls(status_code=400, detail=f"robots.txt fetch failed: {e}")
+    ROBOTS_CACHE[domain] = r.text
+    return r.text
+
+DISALLOW_RE = re.compile(r"disallow:\s*(.*)", re.IGNORECASE)
 
 def parse_robots(robots_text: str, target_path: str) -> dict:
     """
     Very light parser: finds any Disallow rule that blocks the target path.
     """
-    blocked = False
+    matched = []
     rules = []
     for line in robots_text.splitlines():
-        m = re.match(r"(?i)disallow:\s*(.*)", line)
-        if m:
-            rule = m.group(1).strip()
-            rules.append(rule or "/")
-            if target_path.startswith(rule):
-                blocked = True
+        # cheap prefix test first; most lines are not Disallow rules
+        if line[:9].lower() != "disallow:":
+            continue
+        rule = DISALLOW_RE.match(line).group(1).strip()
+        matched.append(rule)
+        rules.append(rule or "/")
+    blocked = target_path.startswith(tuple(matched))
     return {"blocked": blocked, "rules": rules}
 
 # ---- Core Web Vitals via PageSpeed Insights ----
 
 PSI_ENDPOINT = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
 
-def call_psi(url: str, api_key: str) -> dict:
+async def _psi_strategy(client: httpx.AsyncClient, url: str, api_key: str, strat: str):
+    """One PSI run; returns the metrics, or None if PageSpeed refused it."""
+    params = {
+        "url": url,
+        "key": api_key,
+        "strategy": strat,
+        "category": "performance"
+    }
+    r = await client.get(PSI_ENDPOINT, params=params, timeout=30)
+    if r.status_code != 200:
+        return None
+    data = r.json()
+    audits = data["lighthouseResult"]["audits"]
+    metrics = audits["metrics"]["details"]["items"][0]
+    return {
+        "strategy": strat,                         # so the GPT can mention which one succeeded
+        "lcp_ms": metrics["largestContentfulPaint"],
+        "cls": audits["cumulative-layout-shift"]["displayValue"],
+        "inp_ms": metrics.get("experimental_interaction_to_next_paint"),
+        "score": data["lighthouseResult"]["categories"]["performance"]["score"]
+    }
+
+async def call_psi(client: httpx.AsyncClient, url: str, api_key: str) -> dict:
     """
-    Tries mobile first; if PageSpeed blocks or lacks data, retries desktop.
-    Returns the metrics for whichever strategy succeeds.
+    Runs mobile and desktop side by side; returns the metrics of whichever
+    strategy succeeds first and cancels the other.
     """
-    for strat in ("mobile", "desktop"):
-        params = {
-            "url": url,
-            "key": api_key,
-            "strategy": strat,
-            "category": "performance"
-        }
-        r = httpx.get(PSI_ENDPOINT, params=params, timeout=30)
-        if r.status_code == 200:
-            data = r.json()
-            audits = data["lighthouseResult"]["audits"]
-            metrics = audits["metrics"]["details"]["items"][0]
-            return {
-                "strategy": strat,                         # so the GPT can mention which one succeeded
-                "lcp_ms": metrics["largestContentfulPaint"],
-                "cls": audits["cumulative-layout-shift"]["displayValue"],
-                "inp_ms": metrics.get("experimental_interaction_to_next_paint"),
-                "score": data["lighthouseResult"]["categories"]["performance"]["score"]
-            }
+    cached = PSI_CACHE.get(url)
+    if cached is not None:
+        return cached
+    tasks = [
+        asyncio.create_task(_psi_strategy(client, url, api_key, strat))
+        for strat in ("mobile", "desktop")
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                result = await next_done
+            except httpx.HTTPError:
+                continue
+            if result:
+                PSI_CACHE[url] = result
+                return result
+    finally:
+        for t in tasks:
+            t.cancel()
 
     # If both attempts failed:
     raise HTTPException(status_code=400, detail="PSI failed on mobile and desktop")
-
-
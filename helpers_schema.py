@@ -1,12 +1,48 @@
 # helpers_schema.py
-import extruct, requests
+import json, re
+import extruct, jstyleson
+from selectolax.lexbor import LexborHTMLParser
 from w3lib.html import get_base_url
 
-def extract_schema(url: str) -> dict:
-    """Return JSON-LD & Microdata extracted from the page."""
-    html = requests.get(url, timeout=10, headers={
-        "User-Agent": "Mozilla/5.0 (SEO-Auditor)"
-    }).text
-    base = get_base_url(html, url)
-    data = extruct.extract(html, base_url=base, syntaxes=["json-ld", "microdata"])
+# whole-line // comments and <!-- --> wrappers that sites leave around JSON-LD
+COMMENT_LINE_RE = re.compile(r"^\s*(?://.*|<!--.*?-->|<!--|-->)\s*$", re.MULTILINE)
+
+def json_ld_items(script: str) -> list:
+    """
+    Decode one JSON-LD block with extruct's leniency (raw control chars, comments,
+    trailing commas) and keep only non-empty items, as extruct does.
+    """
+    try:
+        data = json.loads(script, strict=False)
+    except ValueError:
+        data = jstyleson.loads(COMMENT_LINE_RE.sub("", script), strict=False)
+    if isinstance(data, list):
+        return [item for item in data if item]
+    if isinstance(data, dict) and data:
+        return [data]
+    return []
+
+def extract_json_ld(tree: LexborHTMLParser) -> list:
+    """Decode every <script type="application/ld+json"> block, skipping malformed ones."""
+    items = []
+    for node in tree.css('script[type="application/ld+json"]'):
+        try:
+            items.extend(json_ld_items(node.text()))
+        except ValueError:
+            continue
+    return items
+
+def extract_schema(html: str, url: str, syntaxes=("json-ld", "microdata")) -> dict:
+    """Return JSON-LD & Microdata extracted from already-fetched page HTML."""
+    tree = LexborHTMLParser(html)
+    data = {}
+    if "json-ld" in syntaxes:
+        data["json-ld"] = extract_json_ld(tree)
+    others = [s for s in syntaxes if s != "json-ld"]
+    # extruct re-parses the whole page, so skip it when there is no microdata to find
+    if others == ["microdata"] and tree.css_first("[itemscope]") is None:
+        data["microdata"] = []
+    elif others:
+        base = get_base_url(html, url)
+        data.update(extruct.extract(html, base_url=base, syntaxes=others))
     return data
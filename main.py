@@ -1,37 +1,66 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from bs4 import BeautifulSoup
-import requests, re, urllib.parse, os
+from selectolax.lexbor import LexborHTMLParser
+import asyncio, re, sys, urllib.parse, os, functools, orjson
+from helpers import make_client, get_page, fetch_robots_txt, parse_robots, call_psi, RobotsTxtNotFound
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-encoded; falls back to stdlib json for what orjson rejects (e.g. >64-bit ints)."""
+
+    def render(self, content) -> bytes:
+        try:
+            return orjson.dumps(content)
+        except orjson.JSONEncodeError:
+            return super().render(content)
+
+
+app = FastAPI(default_response_class=FastJSONResponse)
+
+WORD_RE = re.compile(r"\w+")
+
+
+@app.on_event("startup")
+async def startup():
+    app.state.client = make_client()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await app.state.client.aclose()
 
-app = FastAPI()
 
 # ---------- helpers ----------
+_SUBDOMAIN_PREFIXES = ("www.", "m.", "web.")
+
+
+@functools.lru_cache(maxsize=4096)
 def short_domain(url: str) -> str:
-    """Return domain.tld (very light, no external cache needed)."""
+    """Return domain.tld (very light; memoised since anchors repeat hosts)."""
     host = urllib.parse.urlparse(url).hostname or ""
-    host = re.sub(r"^(www|m|web)\.", "", host)
+    for prefix in _SUBDOMAIN_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
     parts = host.split(".")
-    return ".".join(parts[-2:]) if len(parts) >= 2 else host
+    # interned so the internal-link check compares by identity
+    return sys.intern(".".join(parts[-2:]) if len(parts) >= 2 else host)
+
+
+# every ASCII byte except a–z and 0–9; non-ASCII is dropped by the encode below
+_NON_ALNUM = bytes(c for c in range(128) if not chr(c).islower() and not chr(c).isdigit())
 
 
 def normalize(text: str) -> str:
     """Lower-case and strip everything except a–z and 0–9."""
-    return re.sub(r"[^a-z0-9]", "", text.lower())
+    return text.lower().encode("ascii", "ignore").translate(None, _NON_ALNUM).decode()
 
 
 # ---------- /fetch-page (optional for debugging) ----------
 @app.get("/fetch-page")
-def fetch_page(url: str):
-    try:
-        r = requests.get(
-            url,
-            timeout=10,
-            headers={"User-Agent": "Mozilla/5.0 (SEO-Auditor)"},
-        )
-        r.raise_for_status()
-        return r.text
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+async def fetch_page(url: str):
+    return await get_page(app.state.client, url)
 
 
 # ---------- /analyze-seo ----------
@@ -41,81 +70,105 @@ class AnalyzeBody(BaseModel):
     primary_keyword: str
 
 
-@app.post("/analyze-seo")
-def analyze_seo(body: AnalyzeBody):
+def _analyze_seo_impl(html: str, url: str, primary_keyword: str) -> dict:
+    """Pure HTML checks + health score; runs in a worker thread, off the event loop."""
+    tree = LexborHTMLParser(html)
+    pk = primary_keyword.lower()
+
+    # basic elements
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node else ""
+    meta_tag = tree.css_first('meta[name="description"]')
+    meta_desc = (meta_tag.attributes.get("content") or "").strip() if meta_tag else ""
+    # whole-document text like get_text() used to give (title included), minus
+    # script/style/template contents, which it never counted as page text
+    tree.strip_tags(["script", "style", "template"])
+    text = tree.root.text(separator=" ", strip=True) if tree.root else ""
+
+    # lower-case each string once; the checks below only read these
+    title_lc = title.lower()
+    meta_lc = meta_desc.lower()
+    lead_lc = text[:150].lower()
+
+    # h1s, links & images: a single walk over the matching nodes
+    self_domain = short_domain(url)
+    h1s = []
+    internal_links = external_links = 0
+    img_total = img_missing_alt = 0
+    for node in tree.css("h1, a[href], img"):
+        tag = node.tag
+        if tag == "a":
+            d = short_domain(node.attributes.get("href") or "")
+            if d == self_domain:
+                internal_links += 1
+            elif d:
+                external_links += 1
+        elif tag == "img":
+            img_total += 1
+            if not node.attributes.get("alt"):
+                img_missing_alt += 1
+        else:
+            h1s.append(node.text(separator=" ", strip=True))
+
+    h1_lc = h1s[0].lower() if h1s else ""
+
+    report = {
+        "title": {
+            "present": bool(title),
+            "length": len(title),
+            "includes_kw": pk in title_lc,
+        },
+        "meta": {
+            "present": bool(meta_desc),
+            "length": len(meta_desc),
+            "includes_kw": pk in meta_lc,
+        },
+        "h1": {
+            "count": len(h1s),
+            "includes_kw": pk in h1_lc,
+        },
+        "word_count": sum(1 for _ in WORD_RE.finditer(text)),
+        "kw_in_first_150": pk in lead_lc,
+        "internal_links": internal_links,
+        "external_links": external_links,
+        "images": {
+            "total": img_total,
+            "missing_alt": img_missing_alt,
+        },
+        "url_contains_kw": normalize(pk) in normalize(url),
+    }
+
+    # ---------- health score ----------
+    pass_flags = [
+        report["title"]["present"] and report["title"]["includes_kw"],
+        report["meta"]["present"] and report["meta"]["includes_kw"],
+        report["h1"]["count"] == 1 and report["h1"]["includes_kw"],
+        report["kw_in_first_150"],
+        report["word_count"] >= 300,
+        report["internal_links"] >= 3,
+        report["images"]["missing_alt"] == 0,
+        report["url_contains_kw"],
+    ]
+    total_checks = len(pass_flags)
+    report["health_score"] = round(sum(pass_flags) / total_checks * 100)
+
+    return report
+
+
+async def run_analysis(html: str, url: str, primary_keyword: str) -> dict:
+    """Run _analyze_seo_impl in a worker thread; shared by every analysing endpoint."""
     try:
-        soup = BeautifulSoup(body.html, "html.parser")
-        pk = body.primary_keyword.lower()
-
-        # basic elements
-        title = soup.title.string.strip() if soup.title and soup.title.string else ""
-        meta_tag = soup.find("meta", attrs={"name": "description"})
-        meta_desc = meta_tag.get("content", "").strip() if meta_tag else ""
-        h1s = [h.get_text(" ", strip=True) for h in soup.find_all("h1")]
-        text = soup.get_text(" ", strip=True)
-
-        report = {
-            "title": {
-                "present": bool(title),
-                "length": len(title),
-                "includes_kw": pk in title.lower(),
-            },
-            "meta": {
-                "present": bool(meta_desc),
-                "length": len(meta_desc),
-                "includes_kw": pk in meta_desc.lower(),
-            },
-            "h1": {
-                "count": len(h1s),
-                "includes_kw": pk in (h1s[0].lower() if h1s else ""),
-            },
-            "word_count": len(re.findall(r"\w+", text)),
-            "kw_in_first_150": pk in text[:150].lower(),
-            "internal_links": len(
-                [
-                    a
-                    for a in soup.find_all("a", href=True)
-                    if short_domain(a["href"]) == short_domain(body.url)
-                ]
-            ),
-            "external_links": len(
-                [
-                    a
-                    for a in soup.find_all("a", href=True)
-                    if short_domain(a["href"])
-                    not in ["", short_domain(body.url)]
-                ]
-            ),
-            "images": {
-                "total": len(soup.find_all("img")),
-                "missing_alt": sum(1 for img in soup.find_all("img") if not img.get("alt")),
-            },
-            "url_contains_kw": normalize(pk) in normalize(body.url),
-        }
-
-        # ---------- health score ----------
-        pass_flags = [
-            report["title"]["present"] and report["title"]["includes_kw"],
-            report["meta"]["present"] and report["meta"]["includes_kw"],
-            report["h1"]["count"] == 1 and report["h1"]["includes_kw"],
-            report["kw_in_first_150"],
-            report["word_count"] >= 300,
-            report["internal_links"] >= 3,
-            report["images"]["missing_alt"] == 0,
-            report["url_contains_kw"],
-        ]
-        total_checks = len(pass_flags)
-        report["health_score"] = round(sum(pass_flags) / total_checks * 100)
-
-        return report
+        return await asyncio.to_thread(_analyze_seo_impl, html, url, primary_keyword)
 
     except Exception as e:
         print("analyze_seo error:", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
-# ---------- imports from helpers ----------
-from helpers import fetch_robots_txt, parse_robots, call_psi
+@app.post("/analyze-seo")
+async def analyze_seo(body: AnalyzeBody):
+    return await run_analysis(body.html, body.url, body.primary_keyword)
+
 
 # ---------- /analyze-seo-url ----------
 class AnalyzeURLBody(BaseModel):
@@ -124,24 +177,19 @@ class AnalyzeURLBody(BaseModel):
 
 
 @app.post("/analyze-seo-url")
-def analyze_seo_url(body: AnalyzeURLBody):
-    """Fetch the page internally, then run the same BeautifulSoup checks."""
-    html = requests.get(
-        body.url,
-        timeout=10,
-        headers={"User-Agent": "Mozilla/5.0 (SEO-Auditor)"},
-    ).text
-    return analyze_seo(
-        AnalyzeBody(html=html, url=body.url, primary_keyword=body.primary_keyword)
-    )
+async def analyze_seo_url(body: AnalyzeURLBody):
+    """Fetch the page internally, then run the same HTML checks."""
+    html = await get_page(app.state.client, body.url)
+    return await run_analysis(html, body.url, body.primary_keyword)
 
 
 # ---------- /robots-check ----------
 @app.get("/robots-check")
-def robots_check(url: str):
-    domain = "{uri.scheme}://{uri.netloc}".format(uri=urllib.parse.urlparse(url))
-    robots_txt = fetch_robots_txt(domain)
-    result = parse_robots(robots_txt, urllib.parse.urlparse(url).path)
+async def robots_check(url: str):
+    uri = urllib.parse.urlsplit(url)
+    domain = "{uri.scheme}://{uri.netloc}".format(uri=uri)
+    robots_txt = await fetch_robots_txt(app.state.client, domain)
+    result = parse_robots(robots_txt, uri.path)
     return {"robots_txt_present": True, **result}
 
 
@@ -151,11 +199,11 @@ class WebVitalsBody(BaseModel):
 
 
 @app.post("/web-vitals")
-def web_vitals(body: WebVitalsBody):
+async def web_vitals(body: WebVitalsBody):
     api_key = os.getenv("PSI_API_KEY")
     if not api_key:
         raise HTTPException(status_code=400, detail="PSI_API_KEY env var not set")
-    return call_psi(body.url, api_key)
+    return await call_psi(app.state.client, body.url, api_key)
 
 
 # ---------- /schema-audit ----------
@@ -167,9 +215,51 @@ class SchemaBody(BaseModel):
 
 
 @app.post("/schema-audit")
-def schema_audit(body: SchemaBody):
+async def schema_audit(body: SchemaBody):
     """Returns structured-data objects (JSON-LD & Microdata) found on the page."""
+    html = await get_page(app.state.client, body.url)
     try:
-        return extract_schema(body.url)
+        return extract_schema(html, body.url)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+# ---------- /full-audit ----------
+def _error_detail(exc: Exception) -> str:
+    return exc.detail if isinstance(exc, HTTPException) else str(exc)
+
+
+class FullAuditBody(BaseModel):
+    url: str
+    primary_keyword: str
+
+
+@app.post("/full-audit")
+async def full_audit(body: FullAuditBody):
+    """Fetch page, robots.txt and PSI concurrently, then run the HTML checks."""
+    client = app.state.client
+    uri = urllib.parse.urlsplit(body.url)
+    domain = "{uri.scheme}://{uri.netloc}".format(uri=uri)
+
+    fetches = [get_page(client, body.url), fetch_robots_txt(client, domain)]
+    api_key = os.getenv("PSI_API_KEY")
+    if api_key:  # web vitals are optional here; /web-vitals reports the missing key
+        fetches.append(call_psi(client, body.url, api_key))
+    # robots.txt and PSI failures are reported per section; only the page itself is required
+    html, robots_txt, *vitals = await asyncio.gather(*fetches, return_exceptions=True)
+    if isinstance(html, Exception):
+        raise html
+
+    seo = await run_analysis(html, body.url, body.primary_keyword)
+    if isinstance(robots_txt, RobotsTxtNotFound):
+        robots = {"robots_txt_present": False}
+    elif isinstance(robots_txt, Exception):  # unknown, e.g. timeout or 5xx
+        robots = {"robots_txt_present": None, "error": _error_detail(robots_txt)}
+    else:
+        robots = {"robots_txt_present": True, **parse_robots(robots_txt, uri.path)}
+
+    # null only when PSI_API_KEY is unset; a failed PSI run reports its error
+    web_vitals = vitals[0] if vitals else None
+    if isinstance(web_vitals, Exception):
+        web_vitals = {"error": _error_detail(web_vitals)}
+    return {"seo": seo, "robots": robots, "web_vitals": web_vitals}
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("extruct")
+pytest.importorskip("jstyleson")
+pytest.importorskip("selectolax")
+
+from helpers_schema import extract_schema, json_ld_items
+
+
+def test_trailing_commas_and_block_comments_decode():
+    assert json_ld_items('{"@type":"Organization","sameAs":["https://x.com/a",],}') == [
+        {"@type": "Organization", "sameAs": ["https://x.com/a"]}
+    ]
+    assert json_ld_items('{"@type":"Product", /* sku */ "sku":"1"}') == [
+        {"@type": "Product", "sku": "1"}
+    ]
+
+
+def test_empty_items_are_dropped():
+    assert json_ld_items("null") == []
+    assert json_ld_items('[{"@type":"A"}, {}, null]') == [{"@type": "A"}]
+
+
+def test_extract_schema_reads_json_ld_blocks():
+    html = (
+        '<html><head><script type="application/ld+json">'
+        '{"@type":"Thing","description":"a\nb",}'
+        "</script></head><body></body></html>"
+    )
+    assert extract_schema(html, "https://example.com/") == {
+        "json-ld": [{"@type": "Thing", "description": "a\nb"}],
+        "microdata": [],
+    }